@@ -1,170 +1,689 @@
 #!/usr/bin/env python3
+# Fully annotated so the module can also be compiled ahead of time with mypyc:
+#   mypyc enhanced_mock_server.py
+#   python3 -c "import enhanced_mock_server; enhanced_mock_server.run()"
+from __future__ import annotations
+
 import json
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import socket
 import threading
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from datetime import datetime
+import traceback
+from array import array
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from operator import length_hint
+from typing import Any, Callable, Final, Optional, Union
 import sys
 
-# Configuration
-INITIAL_STOCK = 500  # 더 많은 재고로 테스트
-PORT = 8083
+# Monotonic integer clock; bound once so the request path skips the attribute lookup
+_pcn: Final = time.perf_counter_ns
+NS_PER_MS: Final = 1_000_000
+NS_PER_SEC: Final = 1_000_000_000
+
+# Configuration (defaults; run() can override host, port, stock and /metrics)
+INITIAL_STOCK: Final = 500  # 더 많은 재고로 테스트
+HOST: Final = '0.0.0.0'
+PORT: Final = 8083
+# Simulated processing time per order (ns); 0 disables it. Previously a fixed 1ms.
+SIMULATED_WORK_NS: Final = int(os.environ.get('MOCK_WORK_NS', '0'))
+# Worker processes sharing the port through SO_REUSEPORT; each runs its own
+# threaded server, so request handling is no longer bound to a single GIL.
+WORKERS: Final = max(1, int(os.environ.get('MOCK_WORKERS', '1')))
+
+# Request parsing
+MAX_LINE: Final = 65536
+MAX_HEADERS: Final = 100  # same limit as http.client
+MAX_BODY: Final = 1 << 20  # request bodies are drained unread; larger ones get 413
+ORDERS_PATH: Final = b'/api/v1/orders'
+METRICS_PATH: Final = b'/metrics'
+INVENTORY_PREFIX: Final = b'/api/v1/inventory/products/'
+
+# Status line and headers, written together with the body in a single wfile.write()
+# instead of send_response()/send_header()/end_headers(). No Date/Server headers.
+# The Connection slot takes MockHandler.connection_token.
+OK_HEAD: Final = (b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                  b'Connection: %s\r\nContent-Length: %d\r\n\r\n')
+CREATED_HEAD: Final = (b'HTTP/1.1 201 Created\r\nContent-Type: application/json\r\n'
+                       b'Connection: %s\r\nContent-Length: %d\r\n\r\n')
+CONFLICT_HEAD: Final = (b'HTTP/1.1 409 Conflict\r\nContent-Type: application/json\r\n'
+                        b'Connection: %s\r\nContent-Length: %d\r\n\r\n')
+NOT_FOUND_HEAD: Final = b'HTTP/1.1 404 Not Found\r\nConnection: %s\r\nContent-Length: 0\r\n\r\n'
+
+# Response bodies, precomputed so the order path never builds a dict or calls json.dumps
+ORDER_CREATED_BODY: Final = (b'{"orderId":"%s","status":"CONFIRMED",'
+                             b'"message":"Order created successfully","remainingStock":%d}')
+ORDER_REJECTED_BODY: Final = (b'{"error":"INSUFFICIENT_STOCK",'
+                              b'"message":"Insufficient stock for the requested items","orderId":"%s"}')
+INVENTORY_BODY: Final = (b'{"productId":"550e8400-e29b-41d4-a716-446655440001","initialStock":%d,'
+                         b'"availableStock":%d,"reservedStock":%d,"totalOrders":%d,'
+                         b'"successfulOrders":%d,"failedOrders":%d}')
+
+# Preformatted order IDs for the first 100k orders (~5MB); later orders are formatted on demand
+ORDER_ID_FORMAT: Final = b'ORDER-%05d'
+ORDER_ID_CACHE_SIZE: Final = 100_000
+ORDER_IDS: Final = [ORDER_ID_FORMAT % i for i in range(ORDER_ID_CACHE_SIZE)]
+
+
+class AtomicCounter:
+    """Monotonic counter that needs no Python-level lock.
+
+    Backed by a range iterator: ``next()`` and ``length_hint()`` each run as a
+    single C call, so under the GIL they act as an atomic fetch-and-add and an
+    atomic load. A bounded counter refuses to go past ``limit``, which gives a
+    lock-free "decrement if positive" for stock.
+    """
+    __slots__ = ('_limit', '_it')
+
+    def __init__(self, limit: int = sys.maxsize) -> None:
+        self._limit = limit
+        self._it = iter(range(limit))
+
+    def increment(self) -> int:
+        """Add one and return the new value; for counters that never reach their limit."""
+        return next(self._it) + 1
+
+    def try_increment(self) -> Optional[int]:
+        """Add one and return the new value, or None if the limit is reached."""
+        n = next(self._it, None)
+        return None if n is None else n + 1
+
+    @property
+    def value(self) -> int:
+        return self._limit - length_hint(self._it)
+
+
+class OrderBook:
+    """Order count and stock reservations for a single process.
+
+    Both halves are AtomicCounters, so placing an order takes no lock. Orders
+    are counted before stock is reserved and snapshot() loads the reservations
+    first, which keeps reserved <= total; an order in flight between the two
+    steps briefly counts as failed.
+    """
+    __slots__ = ('_orders', '_reservations')
+
+    def __init__(self, stock: int) -> None:
+        self._orders = AtomicCounter()
+        self._reservations = AtomicCounter(stock)
+
+    def place(self) -> tuple[int, Optional[int]]:
+        """Count an order and reserve one unit; return (order number, reserved or None)."""
+        return self._orders.increment(), self._reservations.try_increment()
+
+    def snapshot(self) -> tuple[int, int]:
+        """Return (total orders, reserved units)."""
+        reserved = self._reservations.value
+        return self._orders.value, reserved
+
+
+class SharedOrderBook:
+    """Order count and stock reservations in shared memory, for WORKERS > 1.
+
+    Same interface as OrderBook. A range iterator cannot be shared across
+    processes, so both counts sit in one RawArray behind one process-shared
+    lock: an order takes a single acquire, and snapshots are exact.
+    """
+    __slots__ = ('_stock', '_counts', '_lock')
+
+    def __init__(self, stock: int) -> None:
+        self._stock = stock
+        self._counts: Any = multiprocessing.RawArray('q', 2)  # [orders, reserved]
+        self._lock: Any = multiprocessing.Lock()
+
+    def place(self) -> tuple[int, Optional[int]]:
+        """Count an order and reserve one unit; return (order number, reserved or None)."""
+        counts = self._counts
+        with self._lock:
+            order_number: int = counts[0] + 1
+            counts[0] = order_number
+            reserved: int = counts[1]
+            if reserved >= self._stock:
+                return order_number, None
+            counts[1] = reserved + 1
+        return order_number, reserved + 1
+
+    def snapshot(self) -> tuple[int, int]:
+        """Return (total orders, reserved units)."""
+        counts = self._counts
+        with self._lock:
+            return counts[0], counts[1]
+
+
+def new_order_book(stock: int) -> Union[OrderBook, SharedOrderBook]:
+    return SharedOrderBook(stock) if WORKERS > 1 else OrderBook(stock)
+
 
 # Global state
-available_stock = INITIAL_STOCK
-stock_lock = threading.Lock()
-order_count = 0
-successful_orders = 0
-failed_orders = 0
-concurrent_requests = 0
-max_concurrent = 0
+# Every successful order reserves exactly one unit, so the order book's two
+# counts hold the whole stock invariant: reserved == successful orders,
+# failed == orders - reserved and available == total_stock - reserved.
+total_stock: int = INITIAL_STOCK  # set by run()
+order_book: Union[OrderBook, SharedOrderBook] = new_order_book(INITIAL_STOCK)
+worker_index: int = 0
+child_pids: Final[list[int]] = []  # worker processes forked by run(); only the parent tracks them
+entered_requests = AtomicCounter()
+exited_requests = AtomicCounter()
+max_concurrent: int = 0
+max_concurrent_lock = threading.Lock()  # only taken when a new peak is observed
+
+# Per-thread counter slots (int64), summed across threads on read
+RT_SUM: Final = 0
+RT_COUNT: Final = 1
+COUNTER_SLOTS: Final = 8
 
 # Metrics
-start_time = time.time()
-response_times = []
-order_timestamps = []
+FLUSH_INTERVAL: Final = 0.1  # seconds between merges of the per-thread sample buffers
+RECENT_SAMPLES: Final = 65536  # window of response times kept for percentiles; power of two
+RECENT_MASK: Final = RECENT_SAMPLES - 1
+start_ns: Final = _pcn()
 
-class MockHandler(BaseHTTPRequestHandler):
-    def do_POST(self):
-        global available_stock, order_count, successful_orders, failed_orders
-        global concurrent_requests, max_concurrent
-        
-        request_start = time.time()
+
+def order_snapshot() -> tuple[int, int, int]:
+    """Return (total, successful, failed) orders across all workers."""
+    total, successful = order_book.snapshot()
+    return total, successful, total - successful
+
+
+class ResponseTimeStats:
+    """Response-time min/max in nanoseconds, so /metrics never rescans samples.
+
+    Percentiles come from the most recent samples, kept in a preallocated
+    int64 ring (512KB) that is filled with slice copies. Only updated by
+    flush_samples(), and read, under flush_lock.
+    """
+    __slots__ = ('seen', 'min', 'max', 'recent', 'recorded')
+
+    def __init__(self) -> None:
+        self.seen = False
+        self.min = 0
+        self.max = 0
+        self.recent: array[int] = array('q', bytes(8 * RECENT_SAMPLES))
+        self.recorded = 0  # samples ever written to the ring
+
+    def add_batch(self, batch: array[int]) -> None:
+        if not batch:
+            return
+        batch_min = min(batch)
+        batch_max = max(batch)
+        if not self.seen or batch_min < self.min:
+            self.min = batch_min
+        if batch_max > self.max:
+            self.max = batch_max
+        self.seen = True
+        if len(batch) > RECENT_SAMPLES:
+            self.recorded += len(batch) - RECENT_SAMPLES
+            batch = batch[-RECENT_SAMPLES:]
+        # Slices on both sides have equal length, so the ring never resizes
+        start = self.recorded & RECENT_MASK
+        first = min(len(batch), RECENT_SAMPLES - start)
+        self.recent[start:start + first] = batch[:first]
+        if first < len(batch):
+            self.recent[:len(batch) - first] = batch[first:]
+        self.recorded += len(batch)
+
+    def percentiles(self, *quantiles: float) -> list[int]:
+        """Nearest-rank percentiles of the recent window from a single sort."""
+        ordered = sorted(self.recent[:min(self.recorded, RECENT_SAMPLES)])
+        n = len(ordered)
+        if n == 0:
+            return [0] * len(quantiles)
+        return [ordered[max(0, math.ceil(q * n) - 1)] for q in quantiles]
+
+
+response_time_stats: Final = ResponseTimeStats()
+
+
+class ThreadStats:
+    """Counters and samples owned by one request thread.
+
+    Only the owning thread writes its counters and appends samples, and only
+    flush_samples() removes samples from the front, so the hot path shares no
+    writable state with other threads and takes no lock.
+    """
+    __slots__ = ('owner', 'counters', 'response_times')
+
+    def __init__(self) -> None:
+        self.owner = threading.current_thread()
+        self.counters: array[int] = array('q', bytes(8 * COUNTER_SLOTS))
+        self.response_times: array[int] = array('q')
+
+
+thread_stats: Final = threading.local()
+registered_stats: Final[list[ThreadStats]] = []
+retired_counters: Final[array[int]] = array('q', bytes(8 * COUNTER_SLOTS))  # totals of finished threads
+registered_stats_lock: Final = threading.Lock()  # never taken on the hot path after registration
+flush_lock: Final = threading.Lock()  # serializes flushers, never taken by request threads
+
+
+def local_stats() -> ThreadStats:
+    stats: Optional[ThreadStats] = getattr(thread_stats, 'stats', None)
+    if stats is None:
+        stats = thread_stats.stats = ThreadStats()
+        with registered_stats_lock:
+            registered_stats.append(stats)
+    return stats
+
+
+def counter_totals() -> array[int]:
+    """Sum every thread's counter slots; O(threads), independent of request count."""
+    with registered_stats_lock:
+        totals = array('q', retired_counters)
+        for stats in registered_stats:
+            counters = stats.counters
+            for slot in range(COUNTER_SLOTS):
+                totals[slot] += counters[slot]
+    return totals
+
+
+# Per-worker response-time totals in a shared table; each worker writes only
+# its own row. Order counts live in order_book instead, so they never lag
+# behind another worker's last publish.
+W_RT_SUM: Final = 0
+W_RT_COUNT: Final = 1
+W_RT_MIN: Final = 2
+W_RT_MAX: Final = 3
+W_PEAK_CONCURRENT: Final = 4
+WORKER_SLOTS: Final = 8
+worker_table: Final[Any] = multiprocessing.RawArray('q', WORKERS * WORKER_SLOTS)
+publish_lock: Final = threading.Lock()  # keeps an older snapshot from overwriting a newer one
+
+
+def publish_worker_stats() -> None:
+    """Copy this worker's totals into its row of the shared table."""
+    with publish_lock:
+        totals = counter_totals()
+        row = worker_index * WORKER_SLOTS
+        worker_table[row + W_RT_SUM] = totals[RT_SUM]
+        worker_table[row + W_RT_COUNT] = totals[RT_COUNT]
+        worker_table[row + W_RT_MIN] = response_time_stats.min
+        worker_table[row + W_RT_MAX] = response_time_stats.max
+        worker_table[row + W_PEAK_CONCURRENT] = max_concurrent
+
+
+def worker_totals() -> list[int]:
+    """Totals across workers: this worker's live values plus the others' last publish.
+
+    Peak concurrency is summed over workers, an upper bound on the true peak.
+    """
+    publish_worker_stats()
+    totals = [0] * WORKER_SLOTS
+    for index in range(WORKERS):
+        row: list[int] = worker_table[index * WORKER_SLOTS:(index + 1) * WORKER_SLOTS]
+        if row[W_RT_COUNT] and (totals[W_RT_COUNT] == 0 or row[W_RT_MIN] < totals[W_RT_MIN]):
+            totals[W_RT_MIN] = row[W_RT_MIN]
+        totals[W_RT_MAX] = max(totals[W_RT_MAX], row[W_RT_MAX])
+        for slot in (W_RT_SUM, W_RT_COUNT, W_PEAK_CONCURRENT):
+            totals[slot] += row[slot]
+    return totals
+
+
+def drain(source: array[int]) -> array[int]:
+    """Remove and return everything buffered in source so far."""
+    n = len(source)
+    batch = source[:n]
+    del source[:n]
+    return batch
+
+
+def flush_samples() -> None:
+    """Merge every thread's buffered samples and retire finished threads."""
+    with flush_lock:
+        with registered_stats_lock:
+            all_stats = list(registered_stats)
+        for stats in all_stats:
+            # Checked before draining so a dead thread's last samples are not lost
+            finished = not stats.owner.is_alive()
+            response_time_stats.add_batch(drain(stats.response_times))
+            if finished:
+                with registered_stats_lock:
+                    registered_stats.remove(stats)
+                    for slot in range(COUNTER_SLOTS):
+                        retired_counters[slot] += stats.counters[slot]
+
+
+def run_sample_flusher() -> None:
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        flush_samples()
+        publish_worker_stats()
+
+
+# Progress events from request threads; formatted and printed by run_progress_logger()
+progress_events: Final[queue.SimpleQueue[tuple[int, int, int, int, int]]] = queue.SimpleQueue()
+
+
+def run_progress_logger() -> None:
+    while True:
+        order_number, successful, remaining_stock, concurrent, at_ns = progress_events.get()
+        elapsed = at_ns - start_ns
+        rps = order_number * NS_PER_SEC / elapsed if elapsed > 0 else 0
+        print(f"\r[{time.strftime('%H:%M:%S')}] "
+              f"Orders: {order_number} | Success: {successful} | "
+              f"Failed: {order_number - successful} | Stock: {remaining_stock} | "
+              f"RPS: {rps:.1f} | Concurrent: {concurrent}", 
+              end='', flush=True)
+
+
+def handle_order(handler: MockHandler) -> None:
+    global max_concurrent
+    
+    request_start = _pcn()
+    
+    # Track concurrent requests
+    concurrent = entered_requests.increment() - exited_requests.value
+    if concurrent > max_concurrent:
+        with max_concurrent_lock:
+            if concurrent > max_concurrent:
+                max_concurrent = concurrent
+    
+    try:
+        # Simulate some processing time
+        if SIMULATED_WORK_NS > 0:
+            time.sleep(SIMULATED_WORK_NS / NS_PER_SEC)
         
-        # Track concurrent requests
-        with stock_lock:
-            concurrent_requests += 1
-            if concurrent_requests > max_concurrent:
-                max_concurrent = concurrent_requests
+        stats = local_stats()
+        counters = stats.counters
+        order_number, reserved = order_book.place()
+        if order_number < ORDER_ID_CACHE_SIZE:
+            order_id = ORDER_IDS[order_number]
+        else:
+            order_id = ORDER_ID_FORMAT % order_number
         
-        try:
-            if self.path == '/api/v1/orders':
-                # Simulate some processing time
-                time.sleep(0.001)  # 1ms processing
-                
-                with stock_lock:
-                    order_count += 1
-                    order_id = f"ORDER-{order_count:05d}"
-                    timestamp = datetime.now()
-                    
-                    if available_stock > 0:
-                        available_stock -= 1
-                        successful_orders += 1
-                        order_timestamps.append(timestamp)
-                        
-                        response = {
-                            "orderId": order_id,
-                            "status": "CONFIRMED",
-                            "message": "Order created successfully",
-                            "remainingStock": available_stock
-                        }
-                        status_code = 201
-                        
-                        # Print progress every 100 orders
-                        if successful_orders % 100 == 0:
-                            elapsed = time.time() - start_time
-                            rps = order_count / elapsed if elapsed > 0 else 0
-                            print(f"\r[{timestamp.strftime('%H:%M:%S')}] "
-                                  f"Orders: {order_count} | Success: {successful_orders} | "
-                                  f"Failed: {failed_orders} | Stock: {available_stock} | "
-                                  f"RPS: {rps:.1f} | Concurrent: {concurrent_requests}", 
-                                  end='', flush=True)
-                    else:
-                        failed_orders += 1
-                        response = {
-                            "error": "INSUFFICIENT_STOCK",
-                            "message": "Insufficient stock for the requested items",
-                            "orderId": order_id
-                        }
-                        status_code = 409
-                
-                response_time = (time.time() - request_start) * 1000
-                response_times.append(response_time)
-                
-                self.send_response(status_code)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(response).encode())
-            else:
-                self.send_response(404)
-                self.end_headers()
-        finally:
-            with stock_lock:
-                concurrent_requests -= 1
-    
-    def do_GET(self):
-        if self.path == '/metrics':
-            # Calculate metrics
-            total_time = time.time() - start_time
-            avg_response_time = sum(response_times) / len(response_times) if response_times else 0
-            
-            metrics = {
-                "summary": {
-                    "initialStock": INITIAL_STOCK,
-                    "availableStock": available_stock,
-                    "totalOrders": order_count,
-                    "successfulOrders": successful_orders,
-                    "failedOrders": failed_orders,
-                    "successRate": (successful_orders / order_count * 100) if order_count > 0 else 0,
-                    "totalTime": total_time,
-                    "avgTPS": order_count / total_time if total_time > 0 else 0,
-                    "maxConcurrentRequests": max_concurrent
-                },
-                "responseTime": {
-                    "avg": avg_response_time,
-                    "min": min(response_times) if response_times else 0,
-                    "max": max(response_times) if response_times else 0,
-                    "count": len(response_times)
-                }
-            }
+        if reserved is not None:
+            remaining_stock = total_stock - reserved
             
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(metrics, indent=2).encode())
+            body = ORDER_CREATED_BODY % (order_id, remaining_stock)
+            head = CREATED_HEAD
             
-        elif self.path.startswith('/api/v1/inventory/products/'):
-            response = {
-                "productId": "550e8400-e29b-41d4-a716-446655440001",
-                "initialStock": INITIAL_STOCK,
-                "availableStock": available_stock,
-                "reservedStock": INITIAL_STOCK - available_stock,
-                "totalOrders": order_count,
-                "successfulOrders": successful_orders,
-                "failedOrders": failed_orders
-            }
-            
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(response, indent=2).encode())
+            # Print progress every 100 orders
+            if reserved % 100 == 0:
+                progress_events.put_nowait(
+                    (order_number, reserved, remaining_stock, concurrent, request_start))
         else:
-            self.send_response(404)
-            self.end_headers()
+            body = ORDER_REJECTED_BODY % order_id
+            head = CONFLICT_HEAD
+        
+        elapsed = _pcn() - request_start
+        stats.response_times.append(elapsed)
+        counters[RT_SUM] += elapsed
+        counters[RT_COUNT] += 1
+        
+        handler.wfile.write(head % (handler.connection_token, len(body)) + body)
+    finally:
+        exited_requests.increment()
+
+
+def handle_metrics(handler: MockHandler) -> None:
+    # Calculate metrics
+    flush_samples()
+    # With several workers this is the serving worker's window, a sample of all traffic
+    with flush_lock:
+        p50, p95, p99 = response_time_stats.percentiles(0.50, 0.95, 0.99)
+    total_time = (_pcn() - start_ns) / NS_PER_SEC
+    orders, successful, failed = order_snapshot()
+    totals = worker_totals()
+    rt_count = totals[W_RT_COUNT]
+    
+    metrics = {
+        "summary": {
+            "initialStock": total_stock,
+            "availableStock": total_stock - successful,
+            "totalOrders": orders,
+            "successfulOrders": successful,
+            "failedOrders": failed,
+            "successRate": (successful / orders * 100) if orders > 0 else 0,
+            "totalTime": total_time,
+            "avgTPS": orders / total_time if total_time > 0 else 0,
+            "maxConcurrentRequests": totals[W_PEAK_CONCURRENT]
+        },
+        "responseTime": {
+            "avg": totals[W_RT_SUM] / rt_count / NS_PER_MS if rt_count else 0,
+            "min": totals[W_RT_MIN] / NS_PER_MS,
+            "max": totals[W_RT_MAX] / NS_PER_MS,
+            "p50": p50 / NS_PER_MS,
+            "p95": p95 / NS_PER_MS,
+            "p99": p99 / NS_PER_MS,
+            "count": rt_count
+        }
+    }
+    
+    body = json.dumps(metrics, indent=2).encode()
+    handler.wfile.write(OK_HEAD % (handler.connection_token, len(body)) + body)
+
+
+def handle_inventory(handler: MockHandler) -> None:
+    orders, reserved, failed = order_snapshot()
+    body = INVENTORY_BODY % (total_stock, total_stock - reserved, reserved,
+                             orders, reserved, failed)
+    handler.wfile.write(OK_HEAD % (handler.connection_token, len(body)) + body)
+
+
+def handle_not_found(handler: MockHandler) -> None:
+    handler.wfile.write(NOT_FOUND_HEAD % handler.connection_token)
+
+
+# Exact-path dispatch per method; the inventory prefix is the only non-exact route
+Route = Callable[['MockHandler'], None]
+POST_ROUTES: Final[dict[bytes, Route]] = {ORDERS_PATH: handle_order}
+GET_ROUTES: Final[dict[bytes, Route]] = {METRICS_PATH: handle_metrics}
+ROUTES: Final[dict[bytes, dict[bytes, Route]]] = {b'POST': POST_ROUTES, b'GET': GET_ROUTES}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Every response leaves in a single unbuffered write, so Nagle can only
+    # hold it back waiting for an ACK on keep-alive connections: set TCP_NODELAY.
+    disable_nagle_algorithm = True
+    connection_token = b'close'
+
+    def handle_one_request(self) -> None:
+        # BaseHTTPRequestHandler.parse_request() feeds every header through
+        # email.parser, which costs more than the handlers themselves. The mock
+        # only needs the request line and Content-Length, so parse just those
+        # and keep the path as bytes for the dispatch below. Chunked bodies are
+        # not decoded, so such requests are refused rather than left in the
+        # stream to be read as the next request.
+        self.close_connection = True
+        self.command = ''
+        # Empty rather than 'HTTP/0.9', so send_error() before the request line
+        # is parsed still writes a status line and headers
+        self.request_version = ''
+        self.requestline = ''
+        try:
+            line = self.rfile.readline(MAX_LINE + 1)
+            if line in (b'\r\n', b'\n'):
+                # Tolerate a stray CRLF left after the previous request's body
+                line = self.rfile.readline(MAX_LINE + 1)
+            if not line:
+                return
+            if len(line) > MAX_LINE:
+                self.send_error(414)
+                return
+            parts = line.split()
+            if len(parts) != 3:
+                self.send_error(400)
+                return
+            method, path, version = parts
+            self.command = method.decode('latin-1')
+            self.request_version = version.decode('latin-1')
+
+            content_length = 0
+            connection = b''
+            transfer_encoding = False
+            for _ in range(MAX_HEADERS + 1):
+                header = self.rfile.readline(MAX_LINE + 1)
+                if header in (b'\r\n', b'\n', b''):
+                    break
+                if len(header) > MAX_LINE:
+                    self.send_error(431, 'Header line too long')
+                    return
+                # Names must run straight into the colon; anything else could
+                # hide a Content-Length and desynchronize the connection
+                colon = header.find(b':')
+                name = header[:colon].lower()
+                if colon < 1 or b' ' in name or b'\t' in name:
+                    self.send_error(400, 'Bad header line')
+                    return
+                if name == b'content-length':
+                    value = header[colon + 1:].strip()
+                    if not value.isdigit():
+                        self.send_error(400, 'Bad Content-Length')
+                        return
+                    content_length = int(value)
+                elif name == b'connection':
+                    connection = header[colon + 1:].strip().lower()
+                elif name == b'transfer-encoding':
+                    transfer_encoding = True
+            else:
+                self.send_error(431, 'Too many headers')
+                return
+            if transfer_encoding:
+                self.send_error(501, 'Transfer-Encoding not supported')
+                return
+            if content_length > MAX_BODY:
+                self.send_error(413)
+                return
+            if content_length:
+                # Drain the body so the next request on this connection starts clean
+                self.rfile.read(content_length)
+            if version == b'HTTP/1.1':
+                self.close_connection = connection == b'close'
+            else:
+                self.close_connection = connection != b'keep-alive'
+            self.connection_token = b'close' if self.close_connection else b'keep-alive'
+
+            routes = ROUTES.get(method)
+            if routes is None:
+                self.send_error(501)
+            else:
+                route = routes.get(path)
+                if route is None:
+                    if method == b'GET' and path.startswith(INVENTORY_PREFIX):
+                        route = handle_inventory
+                    else:
+                        route = handle_not_found
+                route(self)
+            self.wfile.flush()
+        except TimeoutError:
+            pass
     
-    def log_message(self, format, *args):
+    def log_message(self, format: str, *args: object) -> None:
         # Suppress request logging
         pass
 
-if __name__ == '__main__':
-    server = HTTPServer(('0.0.0.0', PORT), MockHandler)
-    print(f"🚀 Enhanced Mock Server Started on port {PORT}")
-    print(f"📦 Initial stock: {INITIAL_STOCK}")
-    print(f"📊 Metrics: http://localhost:{PORT}/metrics")
-    print(f"📈 Stock API: http://localhost:{PORT}/api/v1/inventory/products/test/stock")
+class MockServer(ThreadingHTTPServer):
+    # One thread per keep-alive connection; SO_REUSEPORT lets several server
+    # processes bind the same port and have the kernel balance accepts.
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+    def server_bind(self) -> None:
+        # Set directly: the allow_reuse_port class flag only exists from Python 3.11
+        if WORKERS > 1:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+    def service_actions(self) -> None:
+        # Runs every serve_forever() poll in the parent; report workers that died
+        for pid in list(child_pids):
+            reaped, status = os.waitpid(pid, os.WNOHANG)
+            if reaped:
+                child_pids.remove(pid)
+                print(f"\n⚠️  Worker process {pid} exited with status "
+                      f"{os.waitstatus_to_exitcode(status)}; {len(child_pids) + 1} left",
+                      file=sys.stderr, flush=True)
+
+
+def start_worker(index: int, address: tuple[str, int]) -> MockServer:
+    global worker_index
+    worker_index = index
+    server = MockServer(address, MockHandler)
+    threading.Thread(target=run_sample_flusher, name='sample-flusher', daemon=True).start()
+    threading.Thread(target=run_progress_logger, name='progress-logger', daemon=True).start()
+    return server
+
+
+def run_child_worker(index: int, address: tuple[str, int]) -> None:
+    # Ctrl+C reaches the whole process group; only the parent reacts to it and
+    # stops the children with SIGTERM once, so they can publish their totals.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    child_pids.clear()  # siblings forked earlier are the parent's to reap
+    # Never unwind into the parent's run() frame: every path ends in os._exit()
+    status = 1
+    try:
+        server = start_worker(index, address)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        status = 0
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        flush_samples()
+        publish_worker_stats()
+        os._exit(status)
+
+
+def run(host: str = HOST, port: int = PORT, initial_stock: int = INITIAL_STOCK,
+        metrics: bool = True) -> None:
+    """Configure the mock and serve until Ctrl+C or SIGTERM."""
+    global total_stock, order_book
+    total_stock = initial_stock
+    order_book = new_order_book(initial_stock)
+    if not metrics:
+        GET_ROUTES.pop(METRICS_PATH, None)
+    
+    print(f"🚀 Enhanced Mock Server Started on port {port}")
+    print(f"📦 Initial stock: {initial_stock}")
+    if WORKERS > 1:
+        print(f"👷 Worker processes: {WORKERS} (SO_REUSEPORT)")
+    if SIMULATED_WORK_NS > 0:
+        print(f"⏱️  Simulated work: {SIMULATED_WORK_NS / NS_PER_MS:.3f}ms per order")
+    if metrics:
+        print(f"📊 Metrics: http://localhost:{port}/metrics")
+    print(f"📈 Stock API: http://localhost:{port}/api/v1/inventory/products/test/stock")
     print("-" * 80)
     print("Real-time monitoring:")
+    sys.stdout.flush()
+    
+    # Fork before any thread starts; every worker binds its own SO_REUSEPORT socket
+    for index in range(1, WORKERS):
+        pid = os.fork()
+        if pid == 0:
+            run_child_worker(index, (host, port))
+        child_pids.append(pid)
+    # The scripts stop the server with kill; treat SIGTERM like Ctrl+C so the
+    # final summary is printed either way
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
     
+    server = start_worker(0, (host, port))
     try:
         server.serve_forever()
     except KeyboardInterrupt:
+        for pid in child_pids:
+            os.kill(pid, signal.SIGTERM)
+        for pid in child_pids:
+            os.waitpid(pid, 0)
+        flush_samples()
+        totals = worker_totals()
         print(f"\n\n📊 Final Results:")
-        print(f"Total time: {time.time() - start_time:.2f} seconds")
-        print(f"Total orders: {order_count}")
-        print(f"Successful: {successful_orders}")
-        print(f"Failed: {failed_orders}")
-        print(f"Final stock: {available_stock}")
-        print(f"Max concurrent requests: {max_concurrent}")
-        if response_times:
-            print(f"Average response time: {sum(response_times) / len(response_times):.2f}ms")
-        server.shutdown()
\ No newline at end of file
+        print(f"Total time: {(_pcn() - start_ns) / NS_PER_SEC:.2f} seconds")
+        orders, successful, failed = order_snapshot()
+        print(f"Total orders: {orders}")
+        print(f"Successful: {successful}")
+        print(f"Failed: {failed}")
+        print(f"Final stock: {total_stock - successful}")
+        print(f"Max concurrent requests: {totals[W_PEAK_CONCURRENT]}")
+        if totals[W_RT_COUNT]:
+            print(f"Average response time: {totals[W_RT_SUM] / totals[W_RT_COUNT] / NS_PER_MS:.2f}ms")
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    run()